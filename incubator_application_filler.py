@@ -1,11 +1,11 @@
 #!/usr/bin/env python3
 import os
 import click
-import yaml
-import json
 from dotenv import load_dotenv
 from src.logging import logger
-from src.incubator_application import IncubatorApplication
+from src.incubator_application import DEFAULT_BATCH_SIZE, PROVIDER_ENV, IncubatorApplication
+from src.incubator_schemas.application_template import validate_application_template
+from src.utils.json_utils import read_json, write_json
 
 load_dotenv()
 
@@ -14,70 +14,78 @@ def cli():
     """CLI for automatically filling out incubator program applications."""
     pass
 
+def _path_not_found(path, param_hint):
+    """Build the same error click.Path(exists=True) reports, from the open() that found the file missing."""
+    return click.BadParameter(f"Path {click.format_filename(path)!r} does not exist.", param_hint=param_hint)
+
+def _report_progress(question_ids, received_chars):
+    """Show that answers are still streaming in."""
+    click.echo(f"  {', '.join(question_ids)}: {received_chars} characters received")
+
 @cli.command()
-@click.argument('application_template', type=click.Path(exists=True))
-@click.argument('project_profile', type=click.Path(exists=True))
+@click.argument('application_template', type=click.Path())
+@click.argument('project_profile', type=click.Path())
 @click.option('--output', '-o', type=click.Path(), help='Path to save the filled application.')
-@click.option('--api-key', help='API key for the LLM service. Default: uses OPENAI_API_KEY env variable.')
+@click.option('--api-key', help='API key for the LLM service. Default: uses OPENAI_API_KEY, ANTHROPIC_API_KEY or GOOGLE_API_KEY depending on the model.')
 @click.option('--model', default='gpt-4', help='LLM model to use. Supports gpt-*, claude-*, and gemini-* models.')
 @click.option('--temperature', default=0.7, help='Temperature parameter for the LLM, controls randomness.')
-def fill(application_template, project_profile, output, api_key, model, temperature):
+@click.option('--max-concurrency', default=8, type=click.IntRange(min=1), help='Maximum number of concurrent LLM requests.')
+@click.option('--batch-size', default=DEFAULT_BATCH_SIZE, type=click.IntRange(min=1), help='Number of questions answered per LLM request.')
+def fill(application_template, project_profile, output, api_key, model, temperature, max_concurrency, batch_size):
     """Fill an incubator application template with project information."""
     # Get API key from environment if not provided
-    if not api_key:
-        api_key = os.environ.get("OPENAI_API_KEY")
-        if not api_key and model.startswith("gpt"):
-            logger.error("No API key provided. Please provide one with --api-key or set OPENAI_API_KEY.")
+    provider = next((p for p in PROVIDER_ENV if model.startswith(p)), None)
+    if not api_key and provider:
+        api_key = os.environ.get(PROVIDER_ENV[provider])
+        if not api_key:
+            logger.error(f"No API key provided. Please provide one with --api-key or set {PROVIDER_ENV[provider]}.")
             return
-        
-        # Check for other API keys based on model
-        if model.startswith("claude") and not api_key:
-            api_key = os.environ.get("ANTHROPIC_API_KEY")
-            if not api_key:
-                logger.error("No API key provided. Please provide one with --api-key or set ANTHROPIC_API_KEY.")
-                return
-        
-        if model.startswith("gemini") and not api_key:
-            api_key = os.environ.get("GOOGLE_API_KEY")
-            if not api_key:
-                logger.error("No API key provided. Please provide one with --api-key or set GOOGLE_API_KEY.")
-                return
 
-    # Generate default output path if not provided
+    # Generate default output path if not provided; export_answers creates its directory
     if not output:
         base_dir = "incubator_applications"
-        os.makedirs(base_dir, exist_ok=True)
         output = os.path.join(base_dir, f"filled_{os.path.basename(application_template)}")
     
     try:
         # Load application template
         logger.info(f"Loading application template from {application_template}")
-        with open(application_template, 'r') as f:
-            template_data = json.load(f)
+        try:
+            template_data = read_json(application_template)
+        except FileNotFoundError as e:
+            raise _path_not_found(application_template, "'APPLICATION_TEMPLATE'") from e
+        try:
+            validate_application_template(template_data)
+        except ValueError as e:
+            raise click.BadParameter(f"Invalid application template: {e}", param_hint="'APPLICATION_TEMPLATE'") from e
         
         # Create application object
         application = IncubatorApplication(
-            program_name=template_data.get("program_name", "Unknown Program"),
+            program_name=template_data["program_name"],
             application_url=template_data.get("application_url", ""),
             deadline=template_data.get("deadline", "Unknown")
         )
         
         # Add questions from template
-        for q in template_data.get("questions", []):
+        for q in template_data["questions"]:
             application.add_question(
                 question_id=q.get("question_id", f"q{len(application.questions)+1}"),
-                question_text=q.get("question_text", ""),
+                question_text=q["question_text"],
                 max_chars=q.get("max_chars"),
                 expected_content=q.get("expected_content")
             )
         
         # Load project profile
         logger.info(f"Loading project profile from {project_profile}")
-        application.load_project_profile(project_profile)
+        try:
+            application.load_project_profile(project_profile)
+        except FileNotFoundError as e:
+            raise _path_not_found(project_profile, "'PROJECT_PROFILE'") from e
         
         # Generate answers
         logger.info(f"Generating answers using {model} model...")
-        application.generate_answers(api_key, model_name=model, temperature=temperature)
+        application.generate_answers(api_key, model_name=model, temperature=temperature,
+                                     max_concurrency=max_concurrency, batch_size=batch_size,
+                                     on_progress=_report_progress)
         
         # Export filled application
         application.export_answers(output)
@@ -87,6 +95,8 @@ def fill(application_template, project_profile, output, api_key, model, temperat
         click.echo(f"Successfully filled {len(application.questions)} questions for {application.program_name}")
         click.echo(f"Results saved to: {output}")
         
+    except click.ClickException:
+        raise
     except Exception as e:
         logger.error(f"Error filling application: {e}")
         click.echo(f"Error: {e}")
@@ -118,36 +128,63 @@ def create_template(incubator_name, questions, url, deadline, output):
     # Generate default output path if not provided
     if not output:
         base_dir = "incubator_applications"
-        os.makedirs(base_dir, exist_ok=True)
         sanitized_name = incubator_name.lower().replace(" ", "_")
         output = os.path.join(base_dir, f"{sanitized_name}_template.json")
     
-    # Save the template
-    with open(output, 'w') as f:
-        json.dump(template, f, indent=2)
+    # Save the template, creating its directory unless it is a bare filename
+    if (output_dir := os.path.dirname(output)):
+        os.makedirs(output_dir, exist_ok=True)
+    write_json(output, template)
     
     logger.info(f"Created template for {incubator_name} with {questions} questions")
     click.echo(f"Template created at: {output}")
     click.echo("Edit the template to add your actual application questions.")
 
+def _show_application(header, answers):
+    """Print the header fields and every answer of a filled application."""
+    click.echo(f"\n====== {header.get('program_name', 'Unknown Program')} ======")
+    click.echo(f"URL: {header.get('application_url', 'N/A')}")
+    click.echo(f"Deadline: {header.get('deadline', 'N/A')}\n")
+    
+    for i, answer in enumerate(answers, 1):
+        click.echo(f"Q{i}: {answer.get('question', '')}")
+        click.echo(f"{'-' * 40}")
+        click.echo(f"{answer.get('answer', '')}\n")
+        click.echo()
+
+def _show_streamed_application(filled_application):
+    """Print a filled application while parsing it, holding one answer in memory at a time."""
+    import ijson
+    
+    with open(filled_application, 'rb') as f:
+        # export_answers writes the header fields before the answers, so stop once they start
+        header = {}
+        for prefix, event, value in ijson.parse(f):
+            if prefix == 'answers' and event == 'start_array':
+                break
+            if prefix in ('program_name', 'application_url', 'deadline'):
+                header[prefix] = value
+        
+        f.seek(0)
+        _show_application(header, ijson.items(f, 'answers.item'))
+
 @cli.command()
-@click.argument('filled_application', type=click.Path(exists=True))
-def view(filled_application):
+@click.argument('filled_application', type=click.Path())
+@click.option('--stream', is_flag=True, help='Parse the file one answer at a time instead of loading it whole. Requires ijson.')
+def view(filled_application, stream):
     """View a filled application."""
     try:
-        with open(filled_application, 'r') as f:
-            data = json.load(f)
-        
-        click.echo(f"\n====== {data.get('program_name', 'Unknown Program')} ======")
-        click.echo(f"URL: {data.get('application_url', 'N/A')}")
-        click.echo(f"Deadline: {data.get('deadline', 'N/A')}\n")
-        
-        for i, answer in enumerate(data.get('answers', []), 1):
-            click.echo(f"Q{i}: {answer.get('question', '')}")
-            click.echo(f"{'-' * 40}")
-            click.echo(f"{answer.get('answer', '')}\n")
-            click.echo()
+        try:
+            if stream:
+                _show_streamed_application(filled_application)
+            else:
+                data = read_json(filled_application)
+                _show_application(data, data.get('answers', []))
+        except FileNotFoundError as e:
+            raise _path_not_found(filled_application, "'FILLED_APPLICATION'") from e
         
+    except click.ClickException:
+        raise
     except Exception as e:
         logger.error(f"Error viewing application: {e}")
         click.echo(f"Error: {e}")
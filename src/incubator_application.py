@@ -1,18 +1,132 @@
 import os
 import json
-from typing import Dict, List, Any, Optional
+import hashlib
+import functools
+from typing import Callable, Dict, List, Any, Optional
 from dataclasses import dataclass, field, asdict
-import yaml
-from langchain.chains import LLMChain
-from langchain.chat_models import ChatOpenAI
-from langchain.prompts import PromptTemplate
-from langchain_anthropic import ChatAnthropic
-from langchain_google_genai import ChatGoogleGenerativeAI
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from src.logging import logger
-from src.incubator_schemas.project_profile import ProjectProfile
+from src.incubator_schemas.project_profile import PROFILE_CACHE_VERSION, ProjectProfile
+from src.utils.json_utils import read_json, write_json
 
-@dataclass
+# Supported model name prefixes and the environment variable holding each provider's API key
+PROVIDER_ENV = {"gpt": "OPENAI_API_KEY", "claude": "ANTHROPIC_API_KEY", "gemini": "GOOGLE_API_KEY"}
+LLM_PROVIDERS = tuple(PROVIDER_ENV)
+# Number of questions answered by a single LLM request
+DEFAULT_BATCH_SIZE = 5
+# Questions allowing longer answers than this, or with no max_chars, are always sent on their own
+MAX_BATCHED_ANSWER_CHARS = 2000
+# Rough size of an English token, used to turn max_chars into an output token budget
+CHARS_PER_TOKEN = 4
+MIN_OUTPUT_TOKENS = 32
+# Extra output tokens per question for the JSON keys, quotes and escapes of a batched answer
+BATCH_OVERHEAD_TOKENS = 16
+# Number of streamed chunks between progress reports
+STREAM_PROGRESS_CHUNKS = 32
+# Validated project profiles, keyed by PROFILE_CACHE_VERSION and the SHA-256 of the YAML they were parsed from
+PROFILE_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")), "incubator_filler"
+)
+
+# Prompts are rendered with str.format; literal braces are doubled
+_ANSWER_PROMPT = """
+    You are an AI assistant helping a startup answer questions for an incubator application.
+    
+    Here is information about the startup project:
+    {project_info}
+    
+    Please answer the following question for the incubator application:
+    "{question}"
+    
+    {expected_content_text}
+    {max_chars_text}
+    
+    Your answer should be well-structured, specific, and persuasive. Use concrete examples and 
+    details from the provided project information. Format appropriately.
+    """
+
+_BATCH_ANSWER_PROMPT = """
+    You are an AI assistant helping a startup answer questions for an incubator application.
+    
+    Here is information about the startup project:
+    {project_info}
+    
+    Please answer each of the following questions for the incubator application:
+    {questions}
+    
+    Each answer should be well-structured, specific, and persuasive. Use concrete examples and 
+    details from the provided project information.
+    
+    Respond with a single JSON object and nothing else, mapping each question number to its
+    answer, for example: {{"q1": "...", "q2": "..."}}
+    """
+
+@functools.lru_cache(maxsize=8)
+def _get_llm(provider: str, model_name: str, temperature: float, api_key: str):
+    """Return a chat model client, reusing the one (and its HTTP connection pool) from earlier calls.
+
+    The provider SDKs are imported here rather than at module level so that commands which
+    never call an LLM don't pay for loading them.
+    """
+    if provider == "gpt":
+        from langchain_openai import ChatOpenAI
+        
+        return ChatOpenAI(openai_api_key=api_key, model_name=model_name, temperature=temperature)
+    if provider == "claude":
+        from langchain_anthropic import ChatAnthropic
+        
+        return ChatAnthropic(anthropic_api_key=api_key, model_name=model_name, temperature=temperature)
+    if provider == "gemini":
+        from langchain_google_genai import ChatGoogleGenerativeAI
+        
+        return ChatGoogleGenerativeAI(google_api_key=api_key, model=model_name, temperature=temperature)
+    raise ValueError(f"Unsupported provider: {provider}")
+
+def _output_token_budget(questions: List["IncubatorQuestion"]) -> Optional[int]:
+    """Estimate the output tokens needed to answer questions, or None if any answer is unbounded."""
+    if any(not question.max_chars for question in questions):
+        return None
+    budget = sum(max(MIN_OUTPUT_TOKENS, question.max_chars // CHARS_PER_TOKEN) for question in questions)
+    if len(questions) > 1:
+        budget += BATCH_OVERHEAD_TOKENS * len(questions)
+    return budget
+
+def _output_token_limit(model_name: str, max_tokens: Optional[int]) -> Dict[str, Any]:
+    """Return the invoke() keyword arguments that cap the model's output at max_tokens."""
+    if not max_tokens:
+        return {}
+    if model_name.startswith("gemini"):
+        return {"generation_config": {"max_output_tokens": max_tokens}}
+    return {"max_tokens": max_tokens}
+
+def _load_cached_profile(yaml_bytes: bytes) -> ProjectProfile:
+    """Build a ProjectProfile, reusing the cached dump of an identical YAML file when there is one.
+
+    A cached profile is still validated, but skips the YAML parse. Entries are keyed by both
+    the YAML and PROFILE_CACHE_VERSION, so bumping the version starts a fresh cache; unreadable
+    entries are ignored and rewritten.
+    """
+    cache_name = f"v{PROFILE_CACHE_VERSION}-{hashlib.sha256(yaml_bytes).hexdigest()}.json"
+    cache_path = os.path.join(PROFILE_CACHE_DIR, cache_name)
+    try:
+        profile = ProjectProfile.model_validate(read_json(cache_path))
+        logger.debug(f"Loaded project profile from cache {cache_path}")
+        return profile
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning(f"Ignoring unusable project profile cache {cache_path}: {e}")
+    
+    profile = ProjectProfile.from_yaml(yaml_bytes.decode('utf-8'))
+    try:
+        os.makedirs(PROFILE_CACHE_DIR, exist_ok=True)
+        write_json(cache_path, profile.to_dict())
+    except OSError as e:
+        logger.warning(f"Could not write project profile cache {cache_path}: {e}")
+    return profile
+
+@dataclass(slots=True)
 class IncubatorQuestion:
     question_id: str
     question_text: str
@@ -20,14 +134,24 @@ class IncubatorQuestion:
     expected_content: Optional[str] = None  # Hint about what kind of content is expected
     answered: bool = False
     answer: str = ""
+    # Prompt hints derived from max_chars and expected_content, built once in __post_init__
+    max_chars_text: str = field(init=False, default="")
+    expected_content_text: str = field(init=False, default="")
+    
+    def __post_init__(self):
+        if self.max_chars:
+            self.max_chars_text = f"Your answer must be under {self.max_chars} characters."
+        if self.expected_content:
+            self.expected_content_text = f"The answer should focus on: {self.expected_content}"
 
-@dataclass
+@dataclass(slots=True)
 class IncubatorApplication:
     program_name: str
     application_url: str
     deadline: str
     questions: List[IncubatorQuestion] = field(default_factory=list)
     project_profile: Optional[ProjectProfile] = None
+    id: str = field(init=False, default="")
     
     def __post_init__(self):
         self.id = f"{self.program_name.replace(' ', '_').lower()}_{self.deadline.replace('-', '')}"
@@ -38,7 +162,8 @@ class IncubatorApplication:
         question = IncubatorQuestion(
             question_id=question_id,
             question_text=question_text,
-            max_chars=max_chars,
+            # JSON templates may spell whole numbers as 500.0, which would reach the provider as a float max_tokens
+            max_chars=int(max_chars) if max_chars is not None else None,
             expected_content=expected_content
         )
         self.questions.append(question)
@@ -47,10 +172,10 @@ class IncubatorApplication:
     def load_project_profile(self, profile_path: str):
         """Load project profile from a YAML file."""
         try:
-            with open(profile_path, 'r') as file:
-                yaml_str = file.read()
-                self.project_profile = ProjectProfile.from_yaml(yaml_str)
-                logger.info(f"Loaded project profile for {self.project_profile.basic_info.project_name}")
+            with open(profile_path, 'rb') as file:
+                yaml_bytes = file.read()
+            self.project_profile = _load_cached_profile(yaml_bytes)
+            logger.info(f"Loaded project profile for {self.project_profile.basic_info.project_name}")
         except Exception as e:
             logger.error(f"Failed to load project profile: {e}")
             raise
@@ -64,70 +189,152 @@ class IncubatorApplication:
                 return True
         return False
     
-    def generate_answers(self, api_key: str, model_name: str = "gpt-4", temperature: float = 0.7):
-        """Generate answers for all unanswered questions using AI."""
+    def generate_answers(self, api_key: str, model_name: str = "gpt-4", temperature: float = 0.7,
+                         max_concurrency: int = 8, batch_size: int = DEFAULT_BATCH_SIZE,
+                         on_progress: Optional[Callable[[List[str], int], None]] = None):
+        """Generate answers for all unanswered questions using AI.
+
+        Questions are grouped ``batch_size`` at a time into a single prompt so the project
+        information is only sent once per group, and the groups are sent to the LLM
+        concurrently, at most ``max_concurrency`` at a time, so keep it below the provider's
+        rate limit. Questions without a ``max_chars``, or allowing more than
+        ``MAX_BATCHED_ANSWER_CHARS`` characters, are always asked on their own. Each request caps the model's output tokens from the
+        questions' ``max_chars``. Questions with the same text, ``max_chars`` and
+        ``expected_content`` are asked once and share the answer.
+        
+        Responses are streamed; ``on_progress``, if given, is called periodically from the
+        worker threads with the question ids being answered and the characters received so far.
+        """
         if not self.project_profile:
             raise ValueError("Project profile must be loaded before generating answers")
         
         # Choose the appropriate model based on the model_name
-        if model_name.startswith("gpt"):
-            llm = ChatOpenAI(openai_api_key=api_key, model_name=model_name, temperature=temperature)
-        elif model_name.startswith("claude"):
-            llm = ChatAnthropic(anthropic_api_key=api_key, model_name=model_name, temperature=temperature)
-        elif model_name.startswith("gemini"):
-            llm = ChatGoogleGenerativeAI(google_api_key=api_key, model_name=model_name, temperature=temperature)
-        else:
+        provider = next((p for p in LLM_PROVIDERS if model_name.startswith(p)), None)
+        if provider is None:
             raise ValueError(f"Unsupported model: {model_name}")
+        llm = _get_llm(provider, model_name, temperature, api_key)
         
         # Convert project profile to a string representation for the prompt
-        project_data = yaml.dump(self.project_profile.to_dict())
+        project_data = self.project_profile.as_yaml
+        
+        def complete(prompt: str, questions: List[IncubatorQuestion]) -> str:
+            # Pass the budget with the request so the model stops early rather than being trimmed afterwards
+            limit = _output_token_limit(model_name, _output_token_budget(questions))
+            chunks = []
+            for position, chunk in enumerate(llm.stream(prompt, **limit), 1):
+                chunks.append(chunk.content)
+                # Report every few chunks rather than per token to keep the callback overhead down
+                if on_progress and position % STREAM_PROGRESS_CHUNKS == 0:
+                    on_progress([q.question_id for q in questions], sum(len(c) for c in chunks))
+            return "".join(chunks)
         
+        # Identical questions are only asked once and the answer is shared between them
+        def dedupe_key(question: IncubatorQuestion):
+            return question.question_text, question.max_chars, question.expected_content
+        
+        duplicates: Dict[tuple, List[IncubatorQuestion]] = {}
         for question in self.questions:
             if not question.answered:
-                prompt_template = PromptTemplate(
-                    input_variables=["question", "project_info", "max_chars", "expected_content"],
-                    template="""
-                    You are an AI assistant helping a startup answer questions for an incubator application.
-                    
-                    Here is information about the startup project:
-                    {project_info}
-                    
-                    Please answer the following question for the incubator application:
-                    "{question}"
-                    
-                    {expected_content_text}
-                    {max_chars_text}
-                    
-                    Your answer should be well-structured, specific, and persuasive. Use concrete examples and 
-                    details from the provided project information. Format appropriately.
-                    """
-                )
-                
-                # Add conditional text for max_chars and expected_content
-                max_chars_text = f"Your answer must be under {question.max_chars} characters." if question.max_chars else ""
-                expected_content_text = f"The answer should focus on: {question.expected_content}" if question.expected_content else ""
-                
-                chain = LLMChain(llm=llm, prompt=prompt_template)
-                
+                duplicates.setdefault(dedupe_key(question), []).append(question)
+        unanswered = [group[0] for group in duplicates.values()]
+        # Only bounded answers share a request, since their output budget can be summed
+        batchable = [q for q in unanswered if q.max_chars and q.max_chars <= MAX_BATCHED_ANSWER_CHARS]
+        batches = [[q] for q in unanswered if not q.max_chars or q.max_chars > MAX_BATCHED_ANSWER_CHARS]
+        batch_size = max(1, batch_size)
+        batches += [batchable[i:i + batch_size] for i in range(0, len(batchable), batch_size)]
+        
+        if batches:
+            # The calls are I/O-bound, so fan them out instead of waiting on each round-trip in turn
+            with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(batches)))) as executor:
+                future_to_batch = {
+                    executor.submit(self._generate_batch, complete, batch, project_data): batch
+                    for batch in batches
+                }
+                for future in as_completed(future_to_batch):
+                    batch = future_to_batch[future]
+                    try:
+                        for question, answer in future.result():
+                            for duplicate in duplicates[dedupe_key(question)]:
+                                duplicate.answer = answer
+                                duplicate.answered = True
+                                logger.info(f"Generated answer for question: {duplicate.question_id}")
+                    except Exception as e:
+                        question_ids = ", ".join(q.question_id for q in batch)
+                        logger.error(f"Failed to generate answers for questions {question_ids}: {e}")
+        
+        return [q for q in self.questions if q.answered]
+    
+    @classmethod
+    def _generate_batch(cls, complete: Callable[[str, List[IncubatorQuestion]], str], questions: List[IncubatorQuestion], project_data: str):
+        """Answer a group of questions, returning ``(question, answer)`` pairs.
+
+        Questions missing from the batched response, or the whole group if the response
+        cannot be parsed, are retried one request per question.
+        """
+        answers = {}
+        if len(questions) > 1:
+            try:
+                answers = cls._generate_batched_answers(complete, questions, project_data)
+            except ValueError as e:
+                logger.warning(f"Could not parse batched answers, asking questions one by one: {e}")
+        
+        results = []
+        for position, question in enumerate(questions, 1):
+            answer = answers.get(f"q{position}")
+            if answer is None:
                 try:
-                    response = chain.run(
-                        question=question.question_text,
-                        project_info=project_data,
-                        max_chars_text=max_chars_text,
-                        expected_content_text=expected_content_text
-                    )
-                    
-                    # Trim response if it exceeds max_chars
-                    if question.max_chars and len(response) > question.max_chars:
-                        response = response[:question.max_chars]
-                    
-                    question.answer = response.strip()
-                    question.answered = True
-                    logger.info(f"Generated answer for question: {question.question_id}")
+                    answer = cls._generate_answer(complete, question, project_data)
                 except Exception as e:
                     logger.error(f"Failed to generate answer for question {question.question_id}: {e}")
+                    continue
+            results.append((question, cls._fit_answer(question, answer)))
+        return results
+    
+    @staticmethod
+    def _generate_batched_answers(complete: Callable[[str, List[IncubatorQuestion]], str], questions: List[IncubatorQuestion],
+                                  project_data: str) -> Dict[str, str]:
+        """Ask the LLM to answer several questions in one prompt.
+
+        Returns the parsed answers keyed by position (``"q1"``, ``"q2"``, ...).
+        """
+        question_lines = []
+        for position, question in enumerate(questions, 1):
+            question_lines.append(f'q{position}. "{question.question_text}"')
+            if question.expected_content_text:
+                question_lines.append(f"    {question.expected_content_text}")
+            if question.max_chars_text:
+                question_lines.append(f"    {question.max_chars_text}")
         
-        return [q for q in self.questions if q.answered]
+        prompt = _BATCH_ANSWER_PROMPT.format(questions="\n".join(question_lines), project_info=project_data)
+        response = complete(prompt, questions)
+        
+        # Models sometimes wrap the JSON in a code fence or add a sentence around it
+        json_start, json_end = response.find("{"), response.rfind("}")
+        if json_start == -1 or json_end < json_start:
+            raise ValueError("no JSON object in response")
+        answers = json.loads(response[json_start:json_end + 1])
+        if not isinstance(answers, dict):
+            raise ValueError("response is not a JSON object")
+        return {key: value for key, value in answers.items() if isinstance(value, str)}
+    
+    @staticmethod
+    def _generate_answer(complete: Callable[[str, List[IncubatorQuestion]], str], question: IncubatorQuestion,
+                         project_data: str) -> str:
+        """Ask the LLM to answer a single question."""
+        prompt = _ANSWER_PROMPT.format(
+            question=question.question_text,
+            project_info=project_data,
+            max_chars_text=question.max_chars_text,
+            expected_content_text=question.expected_content_text
+        )
+        return complete(prompt, [question])
+    
+    @staticmethod
+    def _fit_answer(question: IncubatorQuestion, response: str) -> str:
+        """Trim response if it exceeds max_chars, in case the model overran its token budget."""
+        if question.max_chars and len(response) > question.max_chars:
+            response = response[:question.max_chars]
+        return response.strip()
     
     def export_answers(self, output_path: str):
         """Export all answered questions to a JSON file."""
@@ -146,9 +353,9 @@ class IncubatorApplication:
         }
         
         try:
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)
-            with open(output_path, 'w') as f:
-                json.dump(answers, f, indent=2)
+            if (output_dir := os.path.dirname(output_path)):
+                os.makedirs(output_dir, exist_ok=True)
+            write_json(output_path, answers)
             logger.info(f"Exported answers to {output_path}")
             return output_path
         except Exception as e:
@@ -158,8 +365,7 @@ class IncubatorApplication:
     def load_from_json(self, json_path: str):
         """Load application questions from a JSON file."""
         try:
-            with open(json_path, 'r') as f:
-                data = json.load(f)
+            data = read_json(json_path)
             
             self.program_name = data.get("program_name", self.program_name)
             self.application_url = data.get("application_url", self.application_url)
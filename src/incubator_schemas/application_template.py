@@ -0,0 +1,37 @@
+from typing import Any
+from jsonschema import Draft202012Validator
+from jsonschema.exceptions import best_match
+
+APPLICATION_TEMPLATE_SCHEMA = {
+    "type": "object",
+    "required": ["program_name", "questions"],
+    "properties": {
+        "program_name": {"type": "string"},
+        "application_url": {"type": "string"},
+        "deadline": {"type": "string"},
+        "questions": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["question_text"],
+                "properties": {
+                    "question_id": {"type": "string"},
+                    "question_text": {"type": "string"},
+                    # jsonschema also accepts whole floats such as 500.0; add_question makes them ints
+                    "max_chars": {"type": ["integer", "null"], "minimum": 1},
+                    "expected_content": {"type": ["string", "null"]},
+                },
+            },
+        },
+    },
+}
+
+# Built once at import so every template is checked against the same prepared validator
+_validator = Draft202012Validator(APPLICATION_TEMPLATE_SCHEMA)
+
+def validate_application_template(data: Any):
+    """Raise ValueError describing the most relevant problem if data is not a valid application template."""
+    error = best_match(_validator.iter_errors(data))
+    if error is not None:
+        location = "/".join(str(part) for part in error.absolute_path) or "template"
+        raise ValueError(f"{location}: {error.message}")
@@ -1,31 +1,62 @@
 from dataclasses import dataclass
-from typing import List, Dict, Optional
+from functools import cached_property
+from typing import Annotated, Any, List, Dict, Mapping, Optional
 import yaml
-from pydantic import BaseModel, EmailStr, HttpUrl, Field
+from pydantic import AfterValidator, BaseModel, ConfigDict, Field, ValidationError
 from src.logging import logger
 
+# Prefer the libyaml C bindings, falling back to the pure-Python implementation
+try:
+    from yaml import CSafeDumper as _Dumper, CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeDumper as _Dumper, SafeLoader as _Loader
+
+def _check_email(value: str) -> str:
+    if "@" not in value:
+        raise ValueError("email address must contain '@'")
+    return value
+
+def _check_url(value: str) -> str:
+    if not value.startswith(("http://", "https://")):
+        raise ValueError("URL must start with http:// or https://")
+    return value
+
+# Bump whenever the models below change, so cached profile dumps from the old models are not reused
+PROFILE_CACHE_VERSION = 1
+
+# Plain strings with a sanity check; the profile only ends up in prompts, so full
+# email and URL parsing would cost more than it is worth
+Email = Annotated[str, AfterValidator(_check_email)]
+Url = Annotated[str, AfterValidator(_check_url)]
+
 class TeamMember(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='ignore')
+    
     full_name: str
     role: str
-    email: Optional[EmailStr] = None
-    linkedin: Optional[HttpUrl] = None
-    github: Optional[HttpUrl] = None
+    email: Optional[Email] = None
+    linkedin: Optional[Url] = None
+    github: Optional[Url] = None
     bio: str
     skills: List[str]
     years_experience: int
     education: List[Dict[str, str]]
 
 class ProjectBasicInfo(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='ignore')
+    
     project_name: str
     tagline: str  # One-line description
-    website: Optional[HttpUrl] = None
-    github_repo: Optional[HttpUrl] = None
+    website: Optional[Url] = None
+    github_repo: Optional[Url] = None
     founding_date: Optional[str] = None
     development_stage: str  # e.g., "Idea", "Prototype", "MVP", "Growth"
     sector: str  # e.g., "Fintech", "Healthtech", "AI/ML"
     industry: List[str]
 
 class ProjectDetails(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='ignore')
+    
     problem_statement: str
     solution_description: str
     unique_value_proposition: str
@@ -38,6 +69,8 @@ class ProjectDetails(BaseModel):
     roadmap: Dict[str, str]  # {"Q1 2023": "Feature X launch", "Q2 2023": "Expand to market Y"}
 
 class TechnicalDetails(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='ignore')
+    
     tech_stack: List[str]
     intellectual_property: Optional[str] = None
     scalability_approach: Optional[str] = None
@@ -45,6 +78,8 @@ class TechnicalDetails(BaseModel):
     future_technological_needs: List[str]
 
 class Funding(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='ignore')
+    
     funding_to_date: Optional[str] = None
     funding_sources: Optional[List[str]] = None
     current_runway: Optional[str] = None
@@ -52,6 +87,8 @@ class Funding(BaseModel):
     use_of_funds: Optional[Dict[str, str]] = None  # {"Development": "40%", "Marketing": "30%"}
 
 class IncubatorPreferences(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='ignore')
+    
     resources_needed: List[str]  # e.g., "Mentorship", "Office Space", "Legal Support"
     program_length_preference: str  # e.g., "3 months", "6 months"
     equity_willingness: Optional[str] = None  # e.g., "Up to 5%", "Negotiable"
@@ -60,44 +97,52 @@ class IncubatorPreferences(BaseModel):
     specific_mentors_desired: Optional[List[str]] = None
     
 class ProjectProfile(BaseModel):
-    team: List[TeamMember]
+    model_config = ConfigDict(frozen=True, extra='ignore')
+    
+    team: List[TeamMember] = Field(default_factory=list)
     basic_info: ProjectBasicInfo
     details: ProjectDetails
     technical: TechnicalDetails
-    funding: Funding
+    funding: Funding = Field(default_factory=Funding)
     incubator_preferences: IncubatorPreferences
     
     @classmethod
     def from_yaml(cls, yaml_str: str):
         logger.debug("Initializing ProjectProfile with provided YAML string")
         try:
-            data = yaml.safe_load(yaml_str)
+            data = yaml.load(yaml_str, Loader=_Loader)
             logger.debug(f"YAML data successfully parsed")
-            return cls(
-                team=[TeamMember(**member) for member in data.get('team', [])],
-                basic_info=ProjectBasicInfo(**data.get('basic_info', {})),
-                details=ProjectDetails(**data.get('details', {})),
-                technical=TechnicalDetails(**data.get('technical', {})),
-                funding=Funding(**data.get('funding', {})),
-                incubator_preferences=IncubatorPreferences(**data.get('incubator_preferences', {}))
-            )
+            return cls.model_validate(data)
         except yaml.YAMLError as e:
             logger.error(f"Error parsing YAML file: {e}")
             raise ValueError("Error parsing YAML file.") from e
+        except ValidationError as e:
+            for error in e.errors():
+                location = ".".join(str(part) for part in error["loc"]) or "profile"
+                logger.error(f"Invalid project profile field {location}: {error['msg']}")
+            raise ValueError(f"Invalid project profile: {e.error_count()} validation error(s).") from e
         except Exception as e:
             logger.error(f"Unexpected error occurred: {e}")
             raise RuntimeError(f"An unexpected error occurred: {e}") from e
     
     def to_dict(self):
         """Convert the project profile to a dictionary."""
-        return {
-            "team": [member.dict() for member in self.team],
-            "basic_info": self.basic_info.dict(),
-            "details": self.details.dict(),
-            "technical": self.technical.dict(),
-            "funding": self.funding.dict(),
-            "incubator_preferences": self.incubator_preferences.dict()
-        }
+        return self.model_dump(mode='json')
+    
+    @cached_property
+    def as_yaml(self) -> str:
+        """Return the project profile serialized as YAML, computed once per instance.
+
+        The model is frozen, so the value can only go stale through model_copy(update=...),
+        which drops it from the copy.
+        """
+        return yaml.dump(self.to_dict(), Dumper=_Dumper)
+    
+    def model_copy(self, *, update: Optional[Mapping[str, Any]] = None, deep: bool = False):
+        copy = super().model_copy(update=update, deep=deep)
+        # The copy starts from this instance's __dict__, which includes the cached as_yaml
+        copy.__dict__.pop('as_yaml', None)
+        return copy
     
     def __str__(self):
         """Return a string representation of the project profile."""
@@ -0,0 +1,27 @@
+from typing import Any
+
+# orjson encodes and decodes in C; fall back to the standard library when it is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+    import json
+
+
+def read_json(path: str) -> Any:
+    """Read and decode a JSON file."""
+    with open(path, 'rb') as f:
+        content = f.read()
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def write_json(path: str, data: Any):
+    """Encode data as indented JSON and write it to path."""
+    if orjson is not None:
+        content = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        content = json.dumps(data, indent=2).encode('utf-8')
+    with open(path, 'wb') as f:
+        f.write(content)